@@ -0,0 +1,20 @@
+-- Bulk link documents to topics in one call from the scraper (store_document_topics).
+-- Run once in the Supabase SQL editor.
+--
+-- Usage: select bulk_insert_document_topics('[{"document_id": "...", "document_date": "2025-01-01",
+--                                                "topic_id": 1, "confidence": 1.0}]'::jsonb);
+
+create or replace function bulk_insert_document_topics(p jsonb)
+returns void
+language plpgsql
+as $$
+begin
+  insert into document_topics (document_id, document_date, topic_id, confidence)
+  select (x->>'document_id')::uuid,
+         (x->>'document_date')::date,
+         (x->>'topic_id')::int,
+         (x->>'confidence')::float
+  from jsonb_array_elements(p) as x
+  on conflict do nothing;
+end;
+$$;
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Export the summarization model to int8 ONNX for text_utils
+
+This script (run once, outside Lambda):
+1. Exports the HuggingFace seq2seq model to ONNX
+2. Applies dynamic int8 quantization to every exported graph
+3. Saves the quantized graphs, config and tokenizer to one directory
+
+Point TOWNWATCH_ONNX_MODEL_DIR at that directory to use it.
+
+Usage:
+    python export_onnx_summarizer.py [model_name] [output_dir]
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+from text_utils import _hf_model_name
+
+
+def export_summarizer(model_name: str, output_dir: str):
+    """Export model_name to ONNX and quantize it to int8 in output_dir"""
+    print(f"\n🔄 Exporting {model_name} to ONNX...")
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    # Dynamic quantization: weights stored as int8, activations quantized at runtime
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+
+    for onnx_file in sorted(Path(output_dir).glob("*.onnx")):
+        print(f"🔄 Quantizing {onnx_file.name}...")
+        quantizer = ORTQuantizer.from_pretrained(output_dir, file_name=onnx_file.name)
+        quantizer.quantize(save_dir=output_dir, quantization_config=qconfig)
+
+        # Replace the fp32 graph so the directory loads with default file names
+        quantized = onnx_file.with_name(f"{onnx_file.stem}_quantized.onnx")
+        os.replace(quantized, onnx_file)
+
+    print(f"\n✅ Quantized model saved to {output_dir}")
+    print(f"   Set TOWNWATCH_ONNX_MODEL_DIR={output_dir} to use it\n")
+
+
+if __name__ == "__main__":
+    model_name = sys.argv[1] if len(sys.argv) > 1 else _hf_model_name
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else "summarizer-onnx-int8"
+    export_summarizer(model_name, output_dir)
@@ -7,21 +7,39 @@ Configured sources in maryland_sources.json
 """
 
 import json
+import logging
 import os
 import hashlib
 import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urljoin
 from uuid import uuid4
 
 from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString
 from supabase import create_client, Client
 
-from text_utils import extract_and_summarize
+try:
+    import ahocorasick
+except ImportError:  # Optional: detect_topics falls back to per-keyword substring checks
+    ahocorasick = None
+
+from text_utils import extract_and_summarize, prefetch_pdf
+
+# Lambda attaches a handler to the root logger; per-row detail is logged at DEBUG
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Board of Estimates agenda line patterns (applied to every line of the agenda PDF)
+_RE_AGENDA_CODE = re.compile(r'^[A-Z]{2,4}-\d{2}-\d+')
+_RE_AGENDA_PAGE_PREFIX = re.compile(r'^P\s*\d+(?:-\d+)?\s+')
+_RE_AGENDA_FIELD_SEP = re.compile(r'\s+-\s+')
+_RE_AGENDA_AMOUNT = re.compile(r'\$[\d,]+(?:\.\d+)?(?:\s?(?:million|billion))?')
 
 
 def _format_list_for_sentence(items: List[str]) -> str:
@@ -88,18 +106,16 @@ def generate_board_of_estimates_summary(full_text: str, date_label: str) -> Opti
     lines = [line.strip() for line in full_text.splitlines() if line.strip()]
     agenda_lines: List[str] = []
 
-    agenda_code_pattern = re.compile(r'^[A-Z]{2,4}-\d{2}-\d+')
-
     parsed_items: List[Dict[str, Any]] = []
 
     for raw_line in lines:
-        cleaned_line = re.sub(r'^P\s*\d+(?:-\d+)?\s+', '', raw_line)
+        cleaned_line = _RE_AGENDA_PAGE_PREFIX.sub('', raw_line)
         cleaned_line = cleaned_line.strip(' -\u2022')
         if not cleaned_line:
             continue
-        if agenda_code_pattern.match(cleaned_line):
+        if _RE_AGENDA_CODE.match(cleaned_line):
             agenda_lines.append(cleaned_line)
-            parts = [part.strip() for part in re.split(r'\s+-\s+', cleaned_line) if part.strip()]
+            parts = [part.strip() for part in _RE_AGENDA_FIELD_SEP.split(cleaned_line) if part.strip()]
             item = {
                 'code': parts[0] if parts else '',
                 'agency': parts[1] if len(parts) > 1 else '',
@@ -139,7 +155,7 @@ def generate_board_of_estimates_summary(full_text: str, date_label: str) -> Opti
                 else:
                     keyword_hits[phrase] += 1
 
-        amount_match = re.search(r'\$[\d,]+(?:\.\d+)?(?:\s?(?:million|billion))?', full_line)
+        amount_match = _RE_AGENDA_AMOUNT.search(full_line)
         if amount_match:
             amount_text = amount_match.group()
             raw_amount = amount_text.lower().replace('$', '').replace(',', '').strip()
@@ -275,13 +291,20 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 # Scraper version for tracking
 SCRAPER_VERSION = "2.0.0-maryland"
 
+# Number of meeting PDFs downloaded ahead of the one being summarized
+PDF_PREFETCH_DEPTH = 3
+
+# Prefetched PDFs sit in memory until their meeting is summarized, so each download is
+# capped far below extract_pdf_text's own budget; bigger PDFs are fetched again on demand
+PDF_PREFETCH_MAX_BYTES = 20_000_000
+
 # Load Maryland sources configuration
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 try:
     with open(os.path.join(SCRIPT_DIR, 'maryland_sources.json'), 'r') as f:
         MD_SOURCES = json.load(f)
 except FileNotFoundError:
-    print("Warning: maryland_sources.json not found, using defaults")
+    logger.warning("maryland_sources.json not found, using defaults")
     MD_SOURCES = {'metadata': {'total_sources': 0}}
 
 # Cache for database lookups to reduce queries
@@ -317,7 +340,7 @@ def get_or_create_country(country_code: str, country_name: str) -> int:
         _cache['countries'][country_code] = country_id
         return country_id
     except Exception as e:
-        print(f"Error getting/creating country {country_code}: {e}")
+        logger.error("Error getting/creating country %s: %s", country_code, e)
         return 1
 
 
@@ -344,7 +367,7 @@ def get_or_create_state(country_id: int, state_code: str, state_name: str) -> in
         _cache['states'][cache_key] = state_id
         return state_id
     except Exception as e:
-        print(f"Error getting/creating state {state_code}: {e}")
+        logger.error("Error getting/creating state %s: %s", state_code, e)
         return 1
 
 
@@ -373,7 +396,7 @@ def get_or_create_source(name: str, source_type: str, state_id: int, website_url
         _cache['sources'][cache_key] = source_id
         return source_id
     except Exception as e:
-        print(f"Error getting/creating source {name}: {e}")
+        logger.error("Error getting/creating source %s: %s", name, e)
         return 1
 
 
@@ -399,7 +422,7 @@ def get_or_create_topic(topic_name: str) -> int:
         _cache['topics'][topic_name] = topic_id
         return topic_id
     except Exception as e:
-        print(f"Error getting/creating topic {topic_name}: {e}")
+        logger.error("Error getting/creating topic %s: %s", topic_name, e)
         return 1
 
 
@@ -418,7 +441,7 @@ def find_duplicate_by_hash(content_hash: str) -> Optional[str]:
             return result.data[0]['id']
         return None
     except Exception as e:
-        print(f"Error checking for duplicate: {e}")
+        logger.error("Error checking for duplicate: %s", e)
         return None
 
 
@@ -433,7 +456,7 @@ def create_scraper_run(source_id: int) -> str:
         }).execute()
         return result.data[0]['id']
     except Exception as e:
-        print(f"Error creating scraper run: {e}")
+        logger.error("Error creating scraper run: %s", e)
         return str(uuid4())
 
 
@@ -450,7 +473,7 @@ def update_scraper_run(run_id: str, status: str, documents_found: int = 0, docum
             'error_message': error_message
         }).eq('id', run_id).execute()
     except Exception as e:
-        print(f"Error updating scraper run: {e}")
+        logger.error("Error updating scraper run: %s", e)
 
 
 # ============================================================================
@@ -493,11 +516,21 @@ def scrape_md_general_assembly() -> List[Dict[str, Any]]:
                     meeting_date = datetime.now().strftime('%Y-%m-%d')
 
                 meeting_lists = cell.find_all('ul')
+
+                # Label each list with the last non-empty text before it, walking each
+                # parent's children once instead of scanning back from every list
+                chambers: Dict[int, str] = {}
+                for parent in {id(ul.parent): ul.parent for ul in meeting_lists}.values():
+                    last_text = None
+                    for child in parent.children:
+                        if isinstance(child, NavigableString):
+                            if child.strip():
+                                last_text = child.strip()
+                        elif child.name == 'ul' and last_text:
+                            chambers[id(child)] = last_text
+
                 for ul in meeting_lists:
-                    chamber = "Unknown"
-                    prev_sibling = ul.find_previous_sibling(text=True)
-                    if prev_sibling:
-                        chamber = prev_sibling.strip()
+                    chamber = chambers.get(id(ul), "Unknown")
 
                     for li in ul.find_all('li'):
                         committee_name = li.get_text(strip=True)
@@ -519,20 +552,59 @@ def scrape_md_general_assembly() -> List[Dict[str, Any]]:
                         documents.append(document)
 
             except Exception as e:
-                print(f"Error parsing meeting cell: {e}")
+                logger.debug("Error parsing meeting cell: %s", e, exc_info=True)
                 continue
 
     except Exception as e:
-        print(f"Error scraping MD General Assembly: {e}")
+        logger.error("Error scraping MD General Assembly: %s", e)
 
     return documents
 
 
+def _pdf_candidates(*urls: Optional[str]) -> List[str]:
+    """Return the given URLs that point at PDFs, in order."""
+    return [url for url in urls if url and url.lower().endswith('.pdf')]
+
+
+def _prefetch_pdf(pdf_url: str) -> Optional[Tuple[Optional[bytes], Dict[str, str]]]:
+    """Download (or revalidate) a PDF ahead of time; None if it hit PDF_PREFETCH_MAX_BYTES."""
+    pdf_bytes, pdf_headers = prefetch_pdf(pdf_url, max_bytes=PDF_PREFETCH_MAX_BYTES)
+    if pdf_bytes is not None and len(pdf_bytes) >= PDF_PREFETCH_MAX_BYTES:
+        return None
+    return pdf_bytes, pdf_headers
+
+
+def _board_of_estimates_fallback_summary(date_text: str) -> str:
+    return (
+        f"Board of Estimates meeting held on {date_text}. Agenda and President's Memorandum "
+        "available for review. Topics include budget, contracts, and city procurement matters."
+    )
+
+
 def summarize_meeting_pdfs(agenda_url: Optional[str], memo_url: Optional[str], date_text: str,
-                           fallback_topics: Optional[List[str]] = None) -> Dict[str, Any]:
-    """Pull summary, full text, and topics from provided agenda/memo PDFs."""
+                           fallback_topics: Optional[List[str]] = None,
+                           full_text_max_chars: int = 5000,
+                           prefetched_pdfs: Optional[Dict[str, Future]] = None) -> Dict[str, Any]:
+    """
+    Pull summary, full text (capped at full_text_max_chars), and topics from agenda/memo PDFs.
+
+    prefetched_pdfs maps PDF URLs to download futures; a matching entry is consumed
+    (and removed) instead of downloading that PDF again, unless it resolved to None.
+    """
     fallback_topics = fallback_topics or ['Budget', 'Contracts', 'Procurement', 'Finance']
 
+    pdf_candidates = _pdf_candidates(agenda_url, memo_url)
+
+    # Nothing to extract - skip straight to the generic summary
+    if not pdf_candidates:
+        summary_text = _board_of_estimates_fallback_summary(date_text)
+        return {
+            'summary': summary_text,
+            'full_text': '',
+            'topics': (detect_topics(summary_text) or fallback_topics)[:8],
+            'url': agenda_url or memo_url
+        }
+
     def sanitize_text(value: Optional[str]) -> Optional[str]:
         if not value:
             return value
@@ -544,13 +616,16 @@ def summarize_meeting_pdfs(agenda_url: Optional[str], memo_url: Optional[str], d
     chosen_url: Optional[str] = None
     agenda_topics: List[str] = []
 
-    for candidate in [agenda_url, memo_url]:
-        if not candidate or not candidate.lower().endswith('.pdf'):
-            continue
-
+    for candidate in pdf_candidates:
         try:
+            pending_pdf = prefetched_pdfs.pop(candidate, None) if prefetched_pdfs else None
+            prefetched = pending_pdf.result() if pending_pdf else None
+            pdf_bytes, pdf_headers = prefetched or (None, None)
+
             result = extract_and_summarize(
                 pdf_url=candidate,
+                pdf_bytes=pdf_bytes,
+                pdf_headers=pdf_headers,
                 summary_length=6,
                 method='huggingface',  # Use AI summarization for best quality
                 pdf_max_pages=1000,
@@ -569,14 +644,11 @@ def summarize_meeting_pdfs(agenda_url: Optional[str], memo_url: Optional[str], d
                 break
 
         except Exception as exc:
-            print(f"Error summarizing PDF {candidate}: {exc}")
+            logger.debug("Error summarizing PDF %s: %s", candidate, exc, exc_info=True)
             continue
 
     if not summary_text:
-        summary_text = (
-            f"Board of Estimates meeting held on {date_text}. Agenda and President's Memorandum "
-            "available for review. Topics include budget, contracts, and city procurement matters."
-        )
+        summary_text = _board_of_estimates_fallback_summary(date_text)
         full_text = ''
 
     # Use HuggingFace key phrases if available, otherwise detect from text
@@ -591,6 +663,10 @@ def summarize_meeting_pdfs(agenda_url: Optional[str], memo_url: Optional[str], d
 
     topics = topics[:8]
 
+    # Topics above are detected from the complete text; only the returned copy is capped
+    if full_text and len(full_text) > full_text_max_chars:
+        full_text = full_text[:full_text_max_chars] + '...'
+
     return {
         'summary': summary_text,
         'full_text': full_text,
@@ -616,6 +692,7 @@ def scrape_baltimore_board_of_estimates() -> List[Dict[str, Any]]:
 
         for table in tables[:1]:
             rows = table.find_all('tr')[1:]
+            meetings = []
 
             for row in rows[:10]:
                 try:
@@ -635,41 +712,78 @@ def scrape_baltimore_board_of_estimates() -> List[Dict[str, Any]]:
                     agenda_link = cells[2].find('a') if len(cells) > 2 else None
                     agenda_url = agenda_link.get('href') if agenda_link else None
 
-                    summary_details = summarize_meeting_pdfs(agenda_url, memo_url, date_text)
-                    summary_text = summary_details['summary']
-                    full_text = summary_details['full_text']
-                    topics = summary_details['topics']
-                    canonical_url = summary_details['url'] or agenda_url or memo_url or url
-
-                    # Avoid storing extremely large blobs in content
-                    trimmed_full_text = None
-                    if full_text:
-                        trimmed_full_text = full_text if len(full_text) <= 5000 else full_text[:5000] + '...'
-
-                    document = {
-                        'title': f"Baltimore Board of Estimates - {date_text}",
-                        'content': summary_text,
-                        'summary': summary_text,
-                        'full_text': trimmed_full_text,
-                        'date': meeting_date,
-                        'source': 'Board of Estimates',
-                        'source_type': 'board',
-                        'state_code': 'MD',
-                        'state_name': 'Maryland',
-                        'country_code': 'US',
-                        'country_name': 'United States',
-                        'topics': topics if topics else ['General'],
-                        'url': canonical_url,
-                        'document_type': 'agenda'
-                    }
-                    documents.append(document)
+                    meetings.append({
+                        'date_text': date_text,
+                        'meeting_date': meeting_date,
+                        'memo_url': memo_url,
+                        'agenda_url': agenda_url
+                    })
 
                 except Exception as e:
-                    print(f"Error parsing BOE row: {e}")
+                    logger.debug("Error parsing BOE row: %s", e, exc_info=True)
                     continue
 
+            # Download upcoming PDFs in the background while the current one is summarized
+            with ThreadPoolExecutor(max_workers=PDF_PREFETCH_DEPTH) as executor:
+                prefetched_pdfs: Dict[str, Future] = {}
+
+                def prefetch(index: int) -> None:
+                    if index >= len(meetings):
+                        return
+                    meeting = meetings[index]
+                    pdf_candidates = _pdf_candidates(meeting['agenda_url'], meeting['memo_url'])
+                    if pdf_candidates and pdf_candidates[0] not in prefetched_pdfs:
+                        prefetched_pdfs[pdf_candidates[0]] = executor.submit(_prefetch_pdf, pdf_candidates[0])
+
+                for index in range(PDF_PREFETCH_DEPTH):
+                    prefetch(index)
+
+                for index, meeting in enumerate(meetings):
+                    prefetch(index + PDF_PREFETCH_DEPTH)
+
+                    try:
+                        date_text = meeting['date_text']
+                        agenda_url = meeting['agenda_url']
+                        memo_url = meeting['memo_url']
+
+                        summary_details = summarize_meeting_pdfs(agenda_url, memo_url, date_text,
+                                                                 prefetched_pdfs=prefetched_pdfs)
+                        summary_text = summary_details['summary']
+                        full_text = summary_details['full_text']
+                        topics = summary_details['topics']
+                        canonical_url = summary_details['url'] or agenda_url or memo_url or url
+
+                        document = {
+                            'title': f"Baltimore Board of Estimates - {date_text}",
+                            'content': summary_text,
+                            'summary': summary_text,
+                            'full_text': full_text or None,
+                            'date': meeting['meeting_date'],
+                            'source': 'Board of Estimates',
+                            'source_type': 'board',
+                            'state_code': 'MD',
+                            'state_name': 'Maryland',
+                            'country_code': 'US',
+                            'country_name': 'United States',
+                            'topics': topics if topics else ['General'],
+                            'url': canonical_url,
+                            'document_type': 'agenda'
+                        }
+                        documents.append(document)
+
+                    except Exception as e:
+                        logger.debug("Error summarizing BOE meeting: %s", e, exc_info=True)
+                        continue
+
+                    finally:
+                        # Don't keep a download this meeting left unused
+                        for candidate in _pdf_candidates(meeting['agenda_url'], meeting['memo_url']):
+                            unused = prefetched_pdfs.pop(candidate, None)
+                            if unused:
+                                unused.cancel()
+
     except Exception as e:
-        print(f"Error scraping Baltimore BOE: {e}")
+        logger.error("Error scraping Baltimore BOE: %s", e)
 
     return documents
 
@@ -730,11 +844,11 @@ def scrape_baltimore_city_council() -> List[Dict[str, Any]]:
                 documents.append(document)
 
             except Exception as e:
-                print(f"Error parsing city council item: {e}")
+                logger.debug("Error parsing city council item: %s", e, exc_info=True)
                 continue
 
     except Exception as e:
-        print(f"Error scraping Baltimore City Council: {e}")
+        logger.error("Error scraping Baltimore City Council: %s", e)
 
     return documents
 
@@ -755,7 +869,10 @@ def scrape_legistar_calendar(url: str, jurisdiction: str, source_name: str) -> L
 
         for row in meeting_rows:
             try:
-                name_cell = row.find('td', class_='MeetingName') or row.find('a', class_='MeetingLink')
+                # Index the row's cells by class once instead of searching the row per field
+                cells = {cls: td for td in row.find_all('td') for cls in td.get('class', [])}
+
+                name_cell = cells.get('MeetingName') or row.find('a', class_='MeetingLink')
                 if name_cell:
                     title = name_cell.get_text(strip=True)
                     meeting_link = name_cell.find('a')
@@ -763,7 +880,7 @@ def scrape_legistar_calendar(url: str, jurisdiction: str, source_name: str) -> L
                 else:
                     continue
 
-                date_cell = row.find('td', class_='MeetingDate')
+                date_cell = cells.get('MeetingDate')
                 if date_cell:
                     date_text = date_cell.get_text(strip=True)
                     try:
@@ -773,8 +890,8 @@ def scrape_legistar_calendar(url: str, jurisdiction: str, source_name: str) -> L
                 else:
                     meeting_date = datetime.now().strftime('%Y-%m-%d')
 
-                time_cell = row.find('td', class_='MeetingTime')
-                location_cell = row.find('td', class_='MeetingLocation')
+                time_cell = cells.get('MeetingTime')
+                location_cell = cells.get('MeetingLocation')
 
                 content = f"Meeting scheduled for {date_text}"
                 if time_cell:
@@ -799,40 +916,70 @@ def scrape_legistar_calendar(url: str, jurisdiction: str, source_name: str) -> L
                 documents.append(document)
 
             except Exception as e:
-                print(f"Error parsing Legistar row: {e}")
+                logger.debug("Error parsing Legistar row: %s", e, exc_info=True)
                 continue
 
     except Exception as e:
-        print(f"Error scraping Legistar calendar for {jurisdiction}: {e}")
+        logger.error("Error scraping Legistar calendar for %s: %s", jurisdiction, e)
 
     return documents
 
 
+TOPIC_KEYWORDS = {
+    'Budget': ['budget', 'funding', 'fiscal', 'revenue', 'expenditure', 'appropriation'],
+    'Housing': ['housing', 'affordable housing', 'development', 'zoning', 'residential'],
+    'Transportation': ['transportation', 'transit', 'traffic', 'parking', 'bike lane', 'road'],
+    'Environment': ['environment', 'climate', 'sustainability', 'green', 'pollution', 'energy'],
+    'Public Safety': ['public safety', 'police', 'fire', 'emergency', 'crime', '911'],
+    'Education': ['education', 'school', 'student', 'teacher', 'curriculum', 'university'],
+    'Health': ['health', 'healthcare', 'medical', 'hospital', 'clinic', 'pandemic'],
+    'Economic Development': ['economic', 'business', 'jobs', 'employment', 'commerce', 'development'],
+    'Planning': ['planning', 'zoning', 'land use', 'urban', 'development'],
+    'Legislation': ['bill', 'legislation', 'law', 'ordinance', 'resolution', 'amendment'],
+    'Contracts': ['contract', 'procurement', 'vendor', 'rfp', 'bid'],
+    'Finance': ['finance', 'financial', 'treasury', 'bonds', 'debt'],
+}
+
+
+def _build_topic_automaton():
+    """Aho-Corasick automaton mapping each keyword to every topic that lists it"""
+    if ahocorasick is None:
+        return None
+
+    keyword_topics: Dict[str, set] = {}
+    for topic, keywords in TOPIC_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_topics.setdefault(keyword, set()).add(topic)
+
+    automaton = ahocorasick.Automaton()
+    for keyword, topics in keyword_topics.items():
+        automaton.add_word(keyword, frozenset(topics))
+    automaton.make_automaton()
+    return automaton
+
+
+# Built once at import: one pass over the text finds every keyword
+_TOPIC_AUTOMATON = _build_topic_automaton()
+
+
 def detect_topics(text: str) -> List[str]:
     """
     Auto-detect topics based on keywords in the text
     """
     text_lower = text.lower()
-    topics = []
-
-    topic_keywords = {
-        'Budget': ['budget', 'funding', 'fiscal', 'revenue', 'expenditure', 'appropriation'],
-        'Housing': ['housing', 'affordable housing', 'development', 'zoning', 'residential'],
-        'Transportation': ['transportation', 'transit', 'traffic', 'parking', 'bike lane', 'road'],
-        'Environment': ['environment', 'climate', 'sustainability', 'green', 'pollution', 'energy'],
-        'Public Safety': ['public safety', 'police', 'fire', 'emergency', 'crime', '911'],
-        'Education': ['education', 'school', 'student', 'teacher', 'curriculum', 'university'],
-        'Health': ['health', 'healthcare', 'medical', 'hospital', 'clinic', 'pandemic'],
-        'Economic Development': ['economic', 'business', 'jobs', 'employment', 'commerce', 'development'],
-        'Planning': ['planning', 'zoning', 'land use', 'urban', 'development'],
-        'Legislation': ['bill', 'legislation', 'law', 'ordinance', 'resolution', 'amendment'],
-        'Contracts': ['contract', 'procurement', 'vendor', 'rfp', 'bid'],
-        'Finance': ['finance', 'financial', 'treasury', 'bonds', 'debt'],
-    }
 
-    for topic, keywords in topic_keywords.items():
-        if any(keyword in text_lower for keyword in keywords):
-            topics.append(topic)
+    if _TOPIC_AUTOMATON is not None:
+        found = set()
+        for _, keyword_topics in _TOPIC_AUTOMATON.iter(text_lower):
+            found |= keyword_topics
+            if len(found) == len(TOPIC_KEYWORDS):
+                break
+        topics = [topic for topic in TOPIC_KEYWORDS if topic in found]
+    else:
+        topics = [
+            topic for topic, keywords in TOPIC_KEYWORDS.items()
+            if any(keyword in text_lower for keyword in keywords)
+        ]
 
     return topics if topics else ['General']
 
@@ -850,6 +997,9 @@ def store_documents(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
     duplicate_count = 0
     error_count = 0
 
+    # (document_id, document_date, topic_id) -> row, linked in bulk after the loop
+    topic_rows: Dict[tuple, Dict[str, Any]] = {}
+
     for doc in documents:
         try:
             title = doc.get('title')
@@ -866,7 +1016,7 @@ def store_documents(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
             source_type = doc.get('source_type', 'council')
 
             if not all([title, document_date, state_code, state_name, source_name]):
-                print(f"Skipping document with missing required fields: {title}")
+                logger.debug("Skipping document with missing required fields: %s", title)
                 error_count += 1
                 continue
 
@@ -919,19 +1069,22 @@ def store_documents(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
                 for topic_name in topics:
                     try:
                         topic_id = get_or_create_topic(topic_name)
-                        supabase.table('document_topics').upsert({
+                        topic_rows[(document_id, document_date, topic_id)] = {
                             'document_id': document_id,
                             'document_date': document_date,  # Required for partitioned table
                             'topic_id': topic_id,
                             'confidence': 1.0
-                        }, on_conflict='document_id,document_date,topic_id').execute()
+                        }
                     except Exception as e:
-                        print(f"Error adding topic '{topic_name}' to document: {e}")
+                        logger.debug("Error adding topic '%s' to document: %s", topic_name, e)
 
         except Exception as e:
-            print(f"Error storing document '{doc.get('title', 'unknown')}': {e}")
+            logger.warning("Error storing document '%s': %s", doc.get('title', 'unknown'), e)
             error_count += 1
 
+    if topic_rows:
+        store_document_topics(list(topic_rows.values()))
+
     return {
         'stored': stored_count,
         'updated': updated_count,
@@ -941,6 +1094,27 @@ def store_documents(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
+def store_document_topics(rows: List[Dict[str, Any]]) -> None:
+    """
+    Link documents to topics in a single round-trip
+
+    Uses the bulk_insert_document_topics RPC (see bulk_insert_document_topics.sql);
+    falls back to one bulk upsert if the function isn't installed yet.
+    """
+    try:
+        supabase.rpc('bulk_insert_document_topics', {'p': rows}).execute()
+        return
+    except Exception as e:
+        logger.warning("bulk_insert_document_topics RPC failed (%s), falling back to bulk upsert", e)
+
+    try:
+        supabase.table('document_topics').upsert(
+            rows, on_conflict='document_id,document_date,topic_id'
+        ).execute()
+    except Exception as e:
+        logger.error("Error adding %d document topics: %s", len(rows), e)
+
+
 # ============================================================================
 # MAIN LAMBDA HANDLER
 # ============================================================================
@@ -949,8 +1123,8 @@ def lambda_handler(event, context):
     """
     AWS Lambda handler - scrapes all Maryland government sources with tracking
     """
-    print(f"Starting Maryland government document scraping (version {SCRAPER_VERSION})...")
-    print(f"Total sources configured: {MD_SOURCES.get('metadata', {}).get('total_sources', 'Unknown')}")
+    logger.info("Starting Maryland government document scraping (version %s)...", SCRAPER_VERSION)
+    logger.info("Total sources configured: %s", MD_SOURCES.get('metadata', {}).get('total_sources', 'Unknown'))
 
     # Initialize Maryland state (ensure it exists in DB)
     country_id = get_or_create_country('US', 'United States')
@@ -1003,7 +1177,7 @@ def lambda_handler(event, context):
         source_type = scraper['type']
         scraper_func = scraper['function']
 
-        print(f"\nScraping {source_name}...")
+        logger.info("Scraping %s...", source_name)
 
         # Get/create source ID
         source_id = get_or_create_source(source_name, source_type, state_id)
@@ -1016,7 +1190,7 @@ def lambda_handler(event, context):
             docs = scraper_func()
             all_documents.extend(docs)
             source_stats[source_name] = len(docs)
-            print(f"✓ {source_name}: {len(docs)} documents found")
+            logger.info("✓ %s: %d documents found", source_name, len(docs))
 
             # Update run with success (will update again after storage)
             update_scraper_run(
@@ -1027,7 +1201,7 @@ def lambda_handler(event, context):
 
         except Exception as e:
             error_msg = str(e)
-            print(f"✗ {source_name}: Failed with error: {error_msg}")
+            logger.error("✗ %s: Failed with error: %s", source_name, error_msg)
             source_stats[source_name] = 0
 
             # Update run with failure
@@ -1039,8 +1213,7 @@ def lambda_handler(event, context):
             )
 
     # Store all documents
-    print(f"\n{'='*60}")
-    print(f"Storing {len(all_documents)} total documents in Supabase...")
+    logger.info("Storing %d total documents in Supabase...", len(all_documents))
     results = store_documents(all_documents)
 
     # Update scraper runs with final storage stats
@@ -1057,7 +1230,7 @@ def lambda_handler(event, context):
     # Prepare response
     response = {
         'statusCode': 200,
-        'body': json.dumps({
+        'body': orjson.dumps({
             'message': 'Maryland government scraping completed',
             'scraper_version': SCRAPER_VERSION,
             'sources_scraped': len(maryland_scrapers),
@@ -1065,30 +1238,28 @@ def lambda_handler(event, context):
             'total_documents_found': len(all_documents),
             'storage_results': results,
             'scraper_runs': len(scraper_runs)
-        }, indent=2)
+        }, option=orjson.OPT_INDENT_2).decode('utf-8')
     }
 
     # Pretty print results
-    print(f"\n{'='*60}")
-    print(f"✅ Maryland Scraping Complete!")
-    print(f"{'='*60}")
-    print(f"Sources scraped:     {len(maryland_scrapers)}")
-    print(f"Documents found:     {len(all_documents)}")
-    print(f"New documents:       {results['stored']}")
-    print(f"Updated documents:   {results['updated']}")
-    print(f"Duplicates skipped:  {results['duplicates']}")
-    print(f"Errors:              {results['errors']}")
-    print(f"{'='*60}")
-    print("\nBreakdown by source:")
+    logger.info("✅ Maryland Scraping Complete!")
+    logger.info("Sources scraped:     %d", len(maryland_scrapers))
+    logger.info("Documents found:     %d", len(all_documents))
+    logger.info("New documents:       %d", results['stored'])
+    logger.info("Updated documents:   %d", results['updated'])
+    logger.info("Duplicates skipped:  %d", results['duplicates'])
+    logger.info("Errors:              %d", results['errors'])
+    logger.info("Breakdown by source:")
     for source, count in source_stats.items():
-        print(f"  {source}: {count}")
-    print(f"{'='*60}\n")
+        logger.info("  %s: %d", source, count)
 
     return response
 
 
 # For local testing
 if __name__ == '__main__':
+    logging.basicConfig(format='%(message)s')
+
     # Test with environment variables
     result = lambda_handler({}, None)
-    print(json.dumps(json.loads(result['body']), indent=2))
+    print(result['body'])  # Already pretty-printed
@@ -4,11 +4,15 @@ Tests the new BART-based summarization on sample government documents
 """
 
 import sys
+import text_utils
 from text_utils import (
     summarize_with_huggingface,
     extract_interesting_sections,
     chunk_text_intelligently,
-    extract_and_summarize
+    extract_and_summarize,
+    clean_extracted_text,
+    _find_indicators,
+    _html_to_text
 )
 
 def test_chunking():
@@ -168,6 +172,86 @@ def test_pdf_extraction_and_summarization():
     return True
 
 
+def test_keyword_matching():
+    """Test indicator/topic matching, text cleaning and HTML decoding against known outputs"""
+    print("\n" + "="*60)
+    print("TEST 5: Keyword Matching and Text Cleaning")
+    print("="*60)
+
+    # Whole words only: "billion" isn't "bill", "renewal" isn't "new", "will_" isn't "will"
+    indicator_cases = [
+        ("the $2 billion bill", {'money', 'policy'}),
+        ("funding of 2 billion", set()),
+        ("renewal of the billboard", set()),
+        ("the will_ of the board", set()),
+        ("minutes approved", {'procedural', 'vote'}),
+        ("call to order.", {'procedural'}),
+        ("they shall amend; residents opposed", {'action', 'change', 'vote'}),
+        ("", set()),
+    ]
+
+    # Topics match substrings, so "billion" does count as "bill"
+    topic_cases = [
+        ("$2 billion", ['Legislation']),
+        ("new bike lane and zoning", ['Housing', 'Transportation', 'Planning']),
+        ("Development", ['Housing', 'Economic Development', 'Planning']),
+        ("nothing here", ['General']),
+    ]
+
+    # Line edges include tabs, \r and non-breaking spaces
+    cleaning_cases = [
+        ("  Agenda   item  \n\t Approved \r\nNext\t\n\n\n\nEnd  ", "Agenda item\nApproved\nNext\n\nEnd"),
+        ("a\r\n\r\n\r\nb", "a\n\nb"),
+        ("x\u00a0\ny", "x\ny"),
+        ("\t\n  \n", ""),
+    ]
+
+    # Non-UTF-8 pages decode from <meta charset> or byte sniffing, not as UTF-8
+    html_cases = [
+        ('<html><head><meta charset="windows-1252"></head><body><p>café — ok</p></body></html>'
+         .encode('cp1252'), "café — ok"),
+        ('<html><body><p>Café résumé</p><script>x()</script></body></html>'.encode('latin-1'),
+         "Café résumé"),
+    ]
+
+    try:
+        import maryland_scraper_v2
+    except Exception as e:  # Needs SUPABASE_URL/SUPABASE_KEY at import
+        maryland_scraper_v2 = None
+        print(f"⚠ Skipping detect_topics checks ({e})")
+
+    automaton = text_utils._INTERESTING_AUTOMATON
+    topic_automaton = maryland_scraper_v2._TOPIC_AUTOMATON if maryland_scraper_v2 else None
+
+    # Same answers with pyahocorasick and with the regex/substring fallbacks
+    try:
+        for use_automaton in (True, False):
+            text_utils._INTERESTING_AUTOMATON = automaton if use_automaton else None
+            if maryland_scraper_v2:
+                maryland_scraper_v2._TOPIC_AUTOMATON = topic_automaton if use_automaton else None
+
+            for text, expected in indicator_cases:
+                assert _find_indicators(text) == expected, (text, use_automaton)
+
+            if maryland_scraper_v2:
+                for text, expected in topic_cases:
+                    assert maryland_scraper_v2.detect_topics(text) == expected, (text, use_automaton)
+    finally:
+        text_utils._INTERESTING_AUTOMATON = automaton
+        if maryland_scraper_v2:
+            maryland_scraper_v2._TOPIC_AUTOMATON = topic_automaton
+
+    for text, expected in cleaning_cases:
+        assert clean_extracted_text(text) == expected, text
+
+    for content, expected in html_cases:
+        assert clean_extracted_text(_html_to_text(content, [])) == expected, content
+
+    print("✓ Indicators, topics, cleaned text and page text match expected outputs")
+
+    return True
+
+
 def main():
     """Run all tests"""
     print("\n" + "#"*60)
@@ -187,6 +271,9 @@ def main():
         # Test 4: PDF extraction
         test_pdf_extraction_and_summarization()
 
+        # Test 5: Keyword matching
+        test_keyword_matching()
+
         print("\n" + "="*60)
         print("✅ ALL TESTS PASSED")
         print("="*60)
@@ -11,11 +11,14 @@ Usage:
     python test_scraper_local.py
 """
 
-import json
+import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any
 
+import orjson
+
 # Import scraper functions from optimized pipeline
 from maryland_scraper_v2 import (
     scrape_md_general_assembly,
@@ -40,8 +43,8 @@ def setup_output_directory():
 def save_to_json(data: Any, filename: str):
     """Save data to JSON file"""
     filepath = os.path.join(OUTPUT_DIR, filename)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     print(f"  💾 Saved to: {filepath}")
 
 
@@ -65,7 +68,7 @@ def print_document_preview(doc: Dict[str, Any], index: int):
 def generate_summary_report(all_results: Dict[str, List[Dict[str, Any]]]):
     """Generate a summary report of scraping results"""
     report = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': datetime.now(),  # orjson writes datetimes as ISO 8601
         'total_sources_scraped': len(all_results),
         'sources': {}
     }
@@ -99,15 +102,14 @@ def generate_summary_report(all_results: Dict[str, List[Dict[str, Any]]]):
     return report
 
 
-def test_single_scraper(scraper_name: str, scraper_func, *args):
-    """Test a single scraper function"""
+def report_scraper_results(scraper_name: str, future: Future) -> List[Dict[str, Any]]:
+    """Wait for a scraper run, then print previews and save its documents"""
     print(f"\n{'='*80}")
     print(f"Testing: {scraper_name}")
     print(f"{'='*80}")
 
     try:
-        print(f"🔄 Scraping {scraper_name}...")
-        documents = scraper_func(*args)
+        documents = future.result()
 
         print(f"✅ Success! Found {len(documents)} documents")
 
@@ -145,51 +147,45 @@ def main():
     print("="*80)
 
     # Setup
+    logging.basicConfig(format='%(message)s')
     setup_output_directory()
 
     # Store all results
     all_results = {}
 
-    # Test 1: Baltimore Board of Estimates (has PDFs to extract!)
-    docs = test_single_scraper(
-        "Baltimore Board of Estimates",
-        scrape_baltimore_board_of_estimates
-    )
-    all_results['Baltimore BOE'] = docs
-
-    # Test 2: Baltimore City Council
-    docs = test_single_scraper(
-        "Baltimore City Council",
-        scrape_baltimore_city_council
-    )
-    all_results['Baltimore City Council'] = docs
-
-    # Test 3: Maryland General Assembly
-    docs = test_single_scraper(
-        "Maryland General Assembly",
-        scrape_md_general_assembly
-    )
-    all_results['MD General Assembly'] = docs
-
-    # Test 4: Montgomery County (Legistar)
-    docs = test_single_scraper(
-        "Montgomery County Council",
-        scrape_legistar_calendar,
-        'https://montgomerycountymd.legistar.com/Calendar.aspx',
-        'Montgomery County',
-        'County Council'
-    )
-    all_results['Montgomery County'] = docs
-
-    # Test 5: Prince George's County (Legistar)
-    docs = test_single_scraper(
-        "Prince Georges County Council",
-        scrape_legistar_calendar,
-        'https://princegeorgescountymd.legistar.com/Calendar.aspx',
-        "Prince George's County",
-        'County Council'
-    )
-    all_results['Prince Georges County'] = docs
+    # (result key, scraper name, scraper function, args)
+    scrapers = [
+        # Baltimore Board of Estimates (has PDFs to extract!)
+        ('Baltimore BOE', "Baltimore Board of Estimates",
+         scrape_baltimore_board_of_estimates, ()),
+        ('Baltimore City Council', "Baltimore City Council",
+         scrape_baltimore_city_council, ()),
+        ('MD General Assembly', "Maryland General Assembly",
+         scrape_md_general_assembly, ()),
+        # Montgomery County (Legistar)
+        ('Montgomery County', "Montgomery County Council",
+         scrape_legistar_calendar,
+         ('https://montgomerycountymd.legistar.com/Calendar.aspx',
+          'Montgomery County',
+          'County Council')),
+        # Prince George's County (Legistar)
+        ('Prince Georges County', "Prince Georges County Council",
+         scrape_legistar_calendar,
+         ('https://princegeorgescountymd.legistar.com/Calendar.aspx',
+          "Prince George's County",
+          'County Council')),
+    ]
+
+    # Every source is a different host, so their HTTP and PDF work can overlap;
+    # results are still reported in the order above
+    print(f"\n🔄 Scraping {len(scrapers)} sources concurrently...")
+    with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+        futures = [
+            (key, name, executor.submit(scraper_func, *args))
+            for key, name, scraper_func, args in scrapers
+        ]
+        for key, name, future in futures:
+            all_results[key] = report_scraper_results(name, future)
 
     # Generate summary report
     print(f"\n{'='*80}")
@@ -10,24 +10,242 @@ Provides functions for:
 - Key topic/phrase extraction
 """
 
+import hashlib
+import json
+import os
 import re
+import tempfile
+import warnings
+from collections import Counter
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Optional, Dict, Any, Tuple
 
 import requests
-import pdfplumber
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ahocorasick
+except ImportError:  # Optional: extract_interesting_sections falls back to a regex scan
+    ahocorasick = None
+
+# PDF/HTML parsers (pymupdf, selectolax, bs4) are imported inside the functions that use
+# them, so summarization-only callers don't pay for them at Lambda cold start
 
 # HuggingFace model cache (loaded once, reused)
 _hf_summarizer = None
-_hf_model_name = "facebook/bart-large-cnn"  # Best free summarization model
+# Distilled BART-CNN: ~40% faster than bart-large-cnn at similar ROUGE scores.
+# TOWNWATCH_SUMMARIZER_MODEL overrides it (e.g. facebook/bart-large-cnn) without a redeploy
+_hf_model_name = os.environ.get("TOWNWATCH_SUMMARIZER_MODEL", "sshleifer/distilbart-cnn-12-6")
+# Optional int8 ONNX export of the summarizer (see export_onnx_summarizer.py)
+_hf_onnx_model_dir = os.environ.get("TOWNWATCH_ONNX_MODEL_DIR")
+# Dynamic int8 quantization of the PyTorch model (TOWNWATCH_QUANTIZE_SUMMARIZER=0 keeps FP32)
+_hf_quantize = os.environ.get("TOWNWATCH_QUANTIZE_SUMMARIZER", "1") != "0"
+
+# spaCy model; each use loads it once, without the components it doesn't need
+_spacy_model_name = "en_core_web_sm"
+_SPACY_EXCLUDES = {
+    # Tokens, stop/punct flags and rule-based sentence boundaries only
+    'summarize': ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"],
+    # Noun chunks need tagger + attribute_ruler (POS) + parser; entities need ner
+    'key_phrases': ["senter", "lemmatizer"],
+}
+
+# Shared HTTP session: keeps TCP/TLS connections to the same host alive across downloads
+_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                            max_retries=Retry(total=3, backoff_factor=0.5))
+_SESSION.mount("https://", _HTTP_ADAPTER)
+_SESSION.mount("http://", _HTTP_ADAPTER)
+_SESSION.headers.update({'User-Agent': 'Mozilla/5.0 (compatible; TownWatch/1.0)'})
+
+# Download budget per requested page; PDFs beyond max_pages * this are cut off
+_PDF_BYTES_PER_PAGE = 200_000
+
+# clean_extracted_text runs over every extracted document, so its patterns are compiled up front
+_RE_MULTI_SPACE = re.compile(r' +')
+_RE_MULTI_NEWLINE = re.compile(r'\n\s*\n\s*\n+')
+_RE_LINE_EDGE_SPACE = re.compile(r'[^\S\n]+\n[^\S\n]*|\n[^\S\n]+')  # Whitespace around a newline
+
+# Sentence boundaries for summarize_text_simple (the no-spaCy fallback)
+_RE_SENTENCE_END = re.compile(r'[.!?]+')
+
+# All-caps section header lines that chunk_text_intelligently splits on
+_RE_SECTION_HEADER = re.compile(r'\n([A-Z][A-Z\s]{10,})\n')
+
+# Candidate words for extract_keywords_simple, minus common stop words
+_RE_KEYWORD = re.compile(r'\b[a-z]{4,}\b')
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'be', 'been',
+    'this', 'that', 'these', 'those', 'will', 'would', 'should', 'could'
+})
+
+# extract_interesting_sections indicators (whole words/phrases in lowercased chunks)
+_INTERESTING_KEYWORDS = {
+    'vote': ['vote', 'voted', 'approved', 'passed', 'rejected', 'opposed'],
+    'policy': ['resolution', 'ordinance', 'bill', 'legislation', 'policy'],
+    'controversy': ['concern', 'objection', 'oppose', 'controversial', 'debate'],
+    'action': ['will', 'shall', 'must', 'require'],
+    'change': ['amend', 'revise', 'change', 'new', 'establish'],
+    'procedural': ['call to order', 'pledge of allegiance', 'roll call', 'minutes approved'],
+}
+_INTERESTING_SCORES = {
+    'money': 10,  # Budget/money mentions
+    'vote': 8,  # Decisions/votes
+    'policy': 7,  # Policy items
+    'controversy': 6,  # Controversy
+    'action': 5,  # Action items
+    'change': 5,  # Changes
+    'procedural': -5,  # Boring procedural stuff
+}
+_RE_MONEY = re.compile(r'\$[\d,]+(?:\.\d+)?(?:\s?(?:million|billion|thousand))?')
+
+
+# Fallback without pyahocorasick: one search per category, each running entirely in C
+_RE_INTERESTING_CATEGORIES = {
+    category: re.compile(r'\b(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + r')\b')
+    for category, keywords in _INTERESTING_KEYWORDS.items()
+}
+
+
+def _build_interesting_automaton():
+    """Aho-Corasick automaton over the indicator keywords (None without pyahocorasick)"""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for category, keywords in _INTERESTING_KEYWORDS.items():
+        for keyword in keywords:
+            automaton.add_word(keyword, (category, len(keyword)))
+    automaton.make_automaton()
+    return automaton
+
+
+_INTERESTING_AUTOMATON = _build_interesting_automaton()
+
+# Extracted PDF text, reused across runs (Lambda keeps /tmp between warm invocations)
+_PDF_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'townwatch_pdf_cache')
 
 
 # ============================================================================
 # PDF EXTRACTION
 # ============================================================================
 
-def extract_pdf_text(pdf_url: str, max_pages: int = 1000, max_chars: int = 500000) -> str:
+def _cache_path(url: str) -> str:
+    return os.path.join(_PDF_CACHE_DIR, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+
+def _cache_load(url: str) -> Optional[Dict[str, Any]]:
+    """Return the cached extraction for url, whatever limits it was made with"""
+    try:
+        with open(_cache_path(url), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_get(url: str, max_pages: int, max_chars: int) -> Optional[Dict[str, Any]]:
+    """Return the cached extraction for url, if one was made with the same limits"""
+    entry = _cache_load(url)
+    if entry is None or entry.get('max_pages') != max_pages or entry.get('max_chars') != max_chars:
+        return None
+    return entry
+
+
+def _cache_put(url: str, entry: Dict[str, Any]) -> None:
+    """Persist an extraction; failures only cost a re-extraction next time"""
+    path = _cache_path(url)
+    try:
+        os.makedirs(_PDF_CACHE_DIR, exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f"Could not cache extracted text for {url}: {e}")
+
+
+def _download_pdf(pdf_url: str, max_bytes: int, etag: Optional[str] = None,
+                  last_modified: Optional[str] = None) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """
+    Download a PDF, optionally as a conditional GET
+
+    Returns:
+        (contents, response headers); contents is None if the server answered
+        304 Not Modified to the given etag/last_modified validators
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    # Stream so huge PDFs never sit fully in memory before we give up on them
+    with _SESSION.get(pdf_url, timeout=30, stream=True, headers=headers) as response:
+        if response.status_code == 304:
+            return None, response.headers
+
+        response.raise_for_status()
+
+        buffer = BytesIO()
+        for chunk in response.iter_content(chunk_size=65536):
+            buffer.write(chunk)
+            if buffer.tell() >= max_bytes:
+                print(f"PDF larger than {max_bytes} bytes, download truncated "
+                      f"(only linearized PDFs stay readable): {pdf_url}")
+                break
+
+        return buffer.getvalue(), response.headers
+
+
+def download_pdf_bytes(pdf_url: str, max_bytes: int = 1000 * _PDF_BYTES_PER_PAGE) -> bytes:
+    """
+    Download a PDF and return its raw bytes
+
+    Unlike the extract_* helpers this raises on network/HTTP errors, so callers
+    that prefetch PDFs in the background can decide how to recover.
+
+    Args:
+        pdf_url: URL to the PDF file
+        max_bytes: Stop downloading after this many bytes (default: ~1000 pages)
+
+    Returns:
+        PDF file contents (possibly truncated to max_bytes)
+    """
+    pdf_bytes, _ = _download_pdf(pdf_url, max_bytes)
+    return pdf_bytes
+
+
+def prefetch_pdf(pdf_url: str,
+                 max_bytes: int = 1000 * _PDF_BYTES_PER_PAGE) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """
+    Download a PDF ahead of an extract_pdf_text call, revalidating any cached extraction
+
+    Sends the cached ETag/Last-Modified just like extract_pdf_text's own download, so an
+    unchanged PDF costs a 304 instead of the whole file. Hand both results to
+    extract_pdf_text as pdf_bytes/pdf_headers. Raises on network/HTTP errors.
+
+    Args:
+        pdf_url: URL to the PDF file
+        max_bytes: Stop downloading after this many bytes (default: ~1000 pages)
+
+    Returns:
+        (contents, response headers); contents is None if the server answered 304
+    """
+    entry = _cache_load(pdf_url)
+    return _download_pdf(
+        pdf_url,
+        max_bytes,
+        etag=entry.get('etag') if entry else None,
+        last_modified=entry.get('last_modified') if entry else None
+    )
+
+
+def extract_pdf_text(pdf_url: str, max_pages: int = 1000, max_chars: int = 500000,
+                     pdf_bytes: Optional[bytes] = None,
+                     pdf_headers: Optional[Dict[str, str]] = None) -> str:
     """
     Extract text content from a PDF URL (handles large 400+ page documents)
 
@@ -35,6 +253,9 @@ def extract_pdf_text(pdf_url: str, max_pages: int = 1000, max_chars: int = 50000
         pdf_url: URL to the PDF file
         max_pages: Maximum number of pages to extract (default: 1000 - handles large docs)
         max_chars: Maximum characters to return (default: 500000 - ~200 pages)
+        pdf_bytes: Already-downloaded PDF contents (skips the download when provided)
+        pdf_headers: Response headers from prefetch_pdf; kept as the cache validators,
+            and with pdf_bytes None they mean the server answered 304 Not Modified
 
     Returns:
         Extracted text content, limited to max_chars
@@ -42,29 +263,48 @@ def extract_pdf_text(pdf_url: str, max_pages: int = 1000, max_chars: int = 50000
     try:
         print(f"Extracting PDF from: {pdf_url}")
 
-        # Download PDF
-        response = requests.get(pdf_url, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (compatible; TownWatch/1.0)'
-        })
-        response.raise_for_status()
+        cached = _cache_get(pdf_url, max_pages, max_chars)
+        response_headers: Dict[str, str] = pdf_headers or {}
+
+        # A prefetch already revalidated the cached text
+        if pdf_bytes is None and pdf_headers is not None and cached:
+            print("✓ PDF unchanged since last extraction, using cached text")
+            return cached['text']
+
+        # Download PDF unless the caller already fetched it
+        if pdf_bytes is None:
+            pdf_bytes, response_headers = _download_pdf(
+                pdf_url,
+                max_bytes=max_pages * _PDF_BYTES_PER_PAGE,
+                etag=cached.get('etag') if cached else None,
+                last_modified=cached.get('last_modified') if cached else None
+            )
+            if pdf_bytes is None and cached:
+                print("✓ PDF unchanged since last extraction, using cached text")
+                return cached['text']
+
+        # Same bytes as last time (prefetched, or the server ignores validators)
+        content_hash = hashlib.sha256(pdf_bytes).hexdigest()
+        if cached and cached.get('content_sha256') == content_hash:
+            print("✓ PDF content unchanged, using cached text")
+            return cached['text']
 
-        # Open PDF from bytes
-        pdf_file = BytesIO(response.content)
+        import pymupdf
 
         text_parts = []
         total_chars = 0
 
-        with pdfplumber.open(pdf_file) as pdf:
-            num_pages = min(len(pdf.pages), max_pages)
+        # Open PDF from bytes (PyMuPDF extracts text in C, far faster than pdfminer)
+        with pymupdf.open(stream=pdf_bytes, filetype="pdf") as pdf:
+            num_pages = min(pdf.page_count, max_pages)
             print(f"Processing {num_pages} pages from PDF")
 
-            for page_num, page in enumerate(pdf.pages[:max_pages], 1):
+            for page_num in range(num_pages):
                 # Extract text from page
-                page_text = page.extract_text()
+                page_text = pdf.load_page(page_num).get_text("text")
 
                 if page_text:
-                    # Clean up text
-                    page_text = clean_extracted_text(page_text)
+                    # Cleaned once the pages are joined; limit is checked on raw length
                     text_parts.append(page_text)
                     total_chars += len(page_text)
 
@@ -72,14 +312,24 @@ def extract_pdf_text(pdf_url: str, max_pages: int = 1000, max_chars: int = 50000
                     if total_chars >= max_chars:
                         break
 
-        # Join all pages
-        full_text = '\n\n'.join(text_parts)
+        # Join all pages, then clean the whole document in one pass
+        full_text = clean_extracted_text('\n\n'.join(text_parts))
 
         # Limit to max_chars
         if len(full_text) > max_chars:
             full_text = full_text[:max_chars] + "..."
 
         print(f"✓ Extracted {len(full_text)} characters from PDF")
+
+        _cache_put(pdf_url, {
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'content_sha256': content_hash,
+            'max_pages': max_pages,
+            'max_chars': max_chars,
+            'text': full_text
+        })
+
         return full_text
 
     except Exception as e:
@@ -87,31 +337,31 @@ def extract_pdf_text(pdf_url: str, max_pages: int = 1000, max_chars: int = 50000
         return ""
 
 
-def extract_pdf_tables(pdf_url: str, max_pages: int = 5) -> List[List[List[str]]]:
+def extract_pdf_tables(pdf_url: str, max_pages: int = 5,
+                       pdf_bytes: Optional[bytes] = None) -> List[List[List[str]]]:
     """
     Extract tables from a PDF (useful for agendas)
 
     Args:
         pdf_url: URL to the PDF file
         max_pages: Maximum number of pages to process
+        pdf_bytes: Already-downloaded PDF contents (skips the download when provided)
 
     Returns:
         List of tables, where each table is a list of rows
     """
     try:
-        response = requests.get(pdf_url, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (compatible; TownWatch/1.0)'
-        })
-        response.raise_for_status()
+        if pdf_bytes is None:
+            pdf_bytes = download_pdf_bytes(pdf_url)
+
+        import pymupdf
 
-        pdf_file = BytesIO(response.content)
         all_tables = []
 
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages[:max_pages]:
-                tables = page.extract_tables()
-                if tables:
-                    all_tables.extend(tables)
+        with pymupdf.open(stream=pdf_bytes, filetype="pdf") as pdf:
+            for page_num in range(min(pdf.page_count, max_pages)):
+                for table in pdf.load_page(page_num).find_tables().tables:
+                    all_tables.append(table.extract())
 
         print(f"✓ Extracted {len(all_tables)} tables from PDF")
         return all_tables
@@ -121,6 +371,35 @@ def extract_pdf_tables(pdf_url: str, max_pages: int = 5) -> List[List[List[str]]
         return []
 
 
+def extract_pdf_all(pdf_url: str, max_pages: int = 1000, max_chars: int = 500000,
+                    table_max_pages: int = 5,
+                    pdf_bytes: Optional[bytes] = None) -> Tuple[str, List[List[List[str]]]]:
+    """
+    Extract both text and tables from a PDF, downloading it only once
+
+    Args:
+        pdf_url: URL to the PDF file
+        max_pages: Maximum number of pages to extract text from
+        max_chars: Maximum characters of text to return
+        table_max_pages: Maximum number of pages to search for tables
+        pdf_bytes: Already-downloaded PDF contents (skips the download when provided)
+
+    Returns:
+        (text, tables) as returned by extract_pdf_text and extract_pdf_tables
+    """
+    if pdf_bytes is None:
+        try:
+            pdf_bytes = download_pdf_bytes(pdf_url, max_bytes=max_pages * _PDF_BYTES_PER_PAGE)
+        except Exception as e:
+            print(f"Error downloading PDF from {pdf_url}: {e}")
+            return "", []
+
+    text = extract_pdf_text(pdf_url, max_pages=max_pages, max_chars=max_chars, pdf_bytes=pdf_bytes)
+    tables = extract_pdf_tables(pdf_url, max_pages=table_max_pages, pdf_bytes=pdf_bytes)
+
+    return text, tables
+
+
 def parse_agenda_table(table: List[List[str]]) -> List[Dict[str, str]]:
     """
     Parse an agenda table into structured items
@@ -159,31 +438,78 @@ def parse_agenda_table(table: List[List[str]]) -> List[Dict[str, str]]:
 # WEBPAGE TEXT EXTRACTION
 # ============================================================================
 
-def extract_webpage_text(url: str, max_chars: int = 5000) -> str:
+def _html_to_text(content: bytes, declared_encodings: List[str], url: str = '') -> str:
+    """
+    Visible text of an HTML document, without script/style/nav/footer/header
+
+    The bytes are decoded up front (declared encodings first, then <meta charset>
+    and byte sniffing) because selectolax would otherwise assume UTF-8.
+    """
+    from bs4.dammit import UnicodeDammit
+
+    markup = UnicodeDammit(content, declared_encodings, is_html=True).unicode_markup or ''
+
+    # selectolax parses in C, an order of magnitude faster than html.parser
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:  # Optional: BeautifulSoup is used instead
+        LexborHTMLParser = None
+
+    if LexborHTMLParser is not None:
+        try:
+            tree = LexborHTMLParser(markup)
+            for node in tree.css("script, style, nav, footer, header"):
+                node.decompose()
+            return tree.root.text(separator=' ', strip=True) if tree.root else ''
+        except Exception as e:
+            print(f"selectolax failed on {url} ({e}), falling back to BeautifulSoup")
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(markup, 'html.parser')
+
+    # Remove script and style elements
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+
+    # Get text
+    return soup.get_text(separator=' ', strip=True)
+
+
+def extract_webpage_text(url: str, max_chars: int = 5000, max_bytes: int = 2_000_000) -> str:
     """
     Extract clean text content from a webpage
 
     Args:
         url: URL of the webpage
         max_chars: Maximum characters to return
+        max_bytes: Stop downloading the page after this many bytes
 
     Returns:
-        Cleaned text content
+        Cleaned text content ("" for non-HTML responses)
     """
     try:
-        response = requests.get(url, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (compatible; TownWatch/1.0)'
-        })
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with _SESSION.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+
+            # Only HTML has page text worth parsing (not PDFs, JSON, images, ...)
+            content_type = response.headers.get('Content-Type', '').lower()
+            if content_type and 'html' not in content_type:
+                print(f"Skipping non-HTML content ({content_type}) at {url}")
+                return ""
+
+            # Cap the download; the parsers cope with a truncated document
+            buffer = BytesIO()
+            for chunk in response.iter_content(chunk_size=65536):
+                buffer.write(chunk)
+                if buffer.tell() >= max_bytes:
+                    break
+            content = buffer.getvalue()
 
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
+            # requests reports ISO-8859-1 for any text/* without a charset, so only trust a declared one
+            declared_encodings = [response.encoding] if 'charset=' in content_type else []
 
-        # Get text
-        text = soup.get_text(separator=' ', strip=True)
+        text = _html_to_text(content, declared_encodings, url)
 
         # Clean up
         text = clean_extracted_text(text)
@@ -217,14 +543,13 @@ def clean_extracted_text(text: str) -> str:
         return ""
 
     # Replace multiple spaces with single space
-    text = re.sub(r' +', ' ', text)
+    text = _RE_MULTI_SPACE.sub(' ', text)
 
     # Replace multiple newlines with double newline
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = _RE_MULTI_NEWLINE.sub('\n\n', text)
 
     # Remove leading/trailing whitespace from each line
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
+    text = _RE_LINE_EDGE_SPACE.sub('\n', text)
 
     # Remove excessive whitespace
     text = text.strip()
@@ -253,14 +578,22 @@ def summarize_text_simple(text: str, num_sentences: int = 5) -> str:
     if not text:
         return ""
 
-    # Split into sentences (simple approach)
-    sentences = re.split(r'[.!?]+', text)
-
-    # Clean sentences
-    sentences = [s.strip() for s in sentences if s.strip()]
-
-    # Take first N sentences
-    summary_sentences = sentences[:num_sentences]
+    # Walk sentence terminators and stop after the first N non-empty sentences
+    # instead of splitting the whole text
+    summary_sentences = []
+    start = 0
+    for match in _RE_SENTENCE_END.finditer(text):
+        if len(summary_sentences) >= num_sentences:
+            break
+        sentence = text[start:match.start()].strip()
+        if sentence:
+            summary_sentences.append(sentence)
+        start = match.end()
+    else:
+        # Text after the last terminator is a sentence too
+        sentence = text[start:].strip()
+        if sentence and len(summary_sentences) < num_sentences:
+            summary_sentences.append(sentence)
 
     # Join with periods
     summary = '. '.join(summary_sentences)
@@ -272,6 +605,28 @@ def summarize_text_simple(text: str, num_sentences: int = 5) -> str:
     return summary
 
 
+@lru_cache(maxsize=None)
+def _get_nlp(kind: str):
+    """
+    Load the spaCy pipeline for kind ('summarize' or 'key_phrases'), cached for reuse
+
+    Excluded components are never deserialized, which keeps load time and
+    memory down. Summarization gets a rule-based sentencizer in place of the
+    parser for sentence boundaries.
+
+    Raises:
+        ImportError: spaCy isn't installed
+        OSError: the spaCy model isn't installed
+    """
+    import spacy
+
+    nlp = spacy.load(_spacy_model_name, exclude=_SPACY_EXCLUDES[kind])
+    if kind == 'summarize':
+        nlp.add_pipe("sentencizer")
+
+    return nlp
+
+
 def summarize_text_smart(text: str, num_sentences: int = 5, max_chars: int = 2000) -> str:
     """
     Smart extractive summarization using spaCy
@@ -287,85 +642,114 @@ def summarize_text_smart(text: str, num_sentences: int = 5, max_chars: int = 200
     Returns:
         Summary text
     """
-    try:
-        import spacy
+    return summarize_texts_smart([text], num_sentences, max_chars)[0]
+
+
+def summarize_texts_smart(texts: List[str], num_sentences: int = 5,
+                          max_chars: int = 2000) -> List[str]:
+    """
+    Smart extractive summarization of several texts in one spaCy pass
+
+    The texts are streamed through nlp.pipe in batches, which is cheaper than
+    calling summarize_text_smart on each one.
+
+    Args:
+        texts: Input texts to summarize
+        num_sentences: Number of sentences to extract per text
+        max_chars: Maximum characters per summary
 
+    Returns:
+        One summary per input text, in order
+    """
+    try:
         # Try to load spaCy model
         try:
-            nlp = spacy.load("en_core_web_sm")
+            nlp = _get_nlp('summarize')
         except OSError:
             print("Warning: spaCy model not found, falling back to simple summarization")
-            return summarize_text_simple(text, num_sentences)
+            return [summarize_text_simple(text, num_sentences) for text in texts]
 
         # Limit input text to avoid processing too much
-        if len(text) > 50000:
-            text = text[:50000]
-
-        # Process text
-        doc = nlp(text)
-
-        # Score sentences based on word frequency and position
-        sentence_scores = {}
-        word_frequencies = {}
-
-        # Calculate word frequencies
-        for token in doc:
-            if not token.is_stop and not token.is_punct and token.text.strip():
-                word = token.text.lower()
-                word_frequencies[word] = word_frequencies.get(word, 0) + 1
-
-        # Normalize frequencies
-        if word_frequencies:
-            max_freq = max(word_frequencies.values())
-            word_frequencies = {k: v/max_freq for k, v in word_frequencies.items()}
-
-        # Score sentences
-        for sent_idx, sent in enumerate(doc.sents):
-            score = 0
-            word_count = 0
-
-            for token in sent:
-                if token.text.lower() in word_frequencies:
-                    score += word_frequencies[token.text.lower()]
-                    word_count += 1
-
-            # Average score per word
-            if word_count > 0:
-                score = score / word_count
-
-            # Boost score for sentences near beginning (important context)
-            if sent_idx < 3:
-                score *= 1.5
-
-            sentence_scores[sent.text] = score
-
-        # Get top N sentences
-        top_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)
-        top_sentences = top_sentences[:num_sentences]
-
-        # Re-order sentences by their original position in text
-        sentences_in_order = []
-        for sent in doc.sents:
-            for selected_sent, score in top_sentences:
-                if sent.text == selected_sent:
-                    sentences_in_order.append(sent.text)
-                    break
-
-        # Join sentences
-        summary = ' '.join(sentences_in_order)
-
-        # Limit to max_chars
-        if len(summary) > max_chars:
-            summary = summary[:max_chars] + "..."
+        texts = [text[:50000] for text in texts]
 
-        return summary
+        # Process texts
+        return [
+            _summarize_doc(doc, num_sentences, max_chars)
+            for doc in nlp.pipe(texts, batch_size=32)
+        ]
 
     except ImportError:
         print("Warning: spaCy not available, using simple summarization")
-        return summarize_text_simple(text, num_sentences)
+        return [summarize_text_simple(text, num_sentences) for text in texts]
     except Exception as e:
         print(f"Error in smart summarization: {e}, falling back to simple")
-        return summarize_text_simple(text, num_sentences)
+        return [summarize_text_simple(text, num_sentences) for text in texts]
+
+
+def _summarize_doc(doc, num_sentences: int, max_chars: int) -> str:
+    """Pick the top-scoring sentences of a processed spaCy Doc, in document order"""
+    import numpy as np
+    from spacy.attrs import IS_PUNCT, IS_SPACE, IS_STOP, LOWER
+
+    if len(doc) == 0:
+        return ""
+
+    # Score sentences based on word frequency and position
+    sentence_scores = {}
+
+    # Token attributes as one array; words are identified by their lowercase form
+    attrs = doc.to_array([LOWER, IS_STOP, IS_PUNCT, IS_SPACE])
+    counted = ~attrs[:, 1:].any(axis=1)
+    _, word_ids = np.unique(attrs[:, 0], return_inverse=True)
+    word_ids = word_ids.ravel()
+
+    # Calculate word frequencies (stop words, punctuation and whitespace aren't counted)
+    word_counts = np.bincount(word_ids[counted], minlength=word_ids.max() + 1)
+
+    # Each token's normalized frequency; tokens whose word was never counted don't score
+    token_counts = word_counts[word_ids]
+    token_scores = token_counts / max(word_counts.max(), 1)
+    token_scored = (token_counts > 0).astype(np.int64)
+
+    # doc.sents regenerates its spans on every pass, so walk it once
+    sents = list(doc.sents)
+    sent_texts = [sent.text for sent in sents]
+
+    # Per-sentence totals. Scores are summed left to right with the builtin sum (zeros
+    # for unscored tokens add exactly): np.add.reduceat's pairwise order rounds
+    # differently and would flip exact ties between sentences
+    starts = [sent.start for sent in sents]
+    token_score_list = token_scores.tolist()
+    score_sums = [sum(token_score_list[sent.start:sent.end]) for sent in sents]
+    scored_words = np.add.reduceat(token_scored, starts)
+
+    # Score sentences
+    for sent_idx, sent_text in enumerate(sent_texts):
+        # Average score per word
+        score = float(score_sums[sent_idx] / scored_words[sent_idx]) if scored_words[sent_idx] else 0
+
+        # Boost score for sentences near beginning (important context)
+        if sent_idx < 3:
+            score *= 1.5
+
+        sentence_scores[sent_text] = score
+
+    # Get top N sentences
+    top_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)
+    top_sentences = top_sentences[:num_sentences]
+
+    # Re-order sentences by their original position in text
+    selected = {sentence for sentence, score in top_sentences}
+    sentences_in_order = [sent_text for sent_text in sent_texts if sent_text in selected]
+
+    # Join sentences
+    summary = ' '.join(sentences_in_order)
+
+    # Limit to max_chars
+    if len(summary) > max_chars:
+        summary = summary[:max_chars] + "..."
+
+    return summary
 
 
 def extract_key_phrases(text: str, top_n: int = 10) -> List[str]:
@@ -380,11 +764,9 @@ def extract_key_phrases(text: str, top_n: int = 10) -> List[str]:
         List of key phrases
     """
     try:
-        import spacy
-
         # Try to load spaCy model
         try:
-            nlp = spacy.load("en_core_web_sm")
+            nlp = _get_nlp('key_phrases')
         except OSError:
             print("Warning: spaCy model not found, using simple keyword extraction")
             return extract_keywords_simple(text, top_n)
@@ -409,17 +791,13 @@ def extract_key_phrases(text: str, top_n: int = 10) -> List[str]:
                 key_phrases.append(ent.text.lower())
 
         # Count frequencies
-        phrase_freq = {}
-        for phrase in key_phrases:
-            phrase = phrase.strip()
-            if len(phrase) > 3:  # Minimum length
-                phrase_freq[phrase] = phrase_freq.get(phrase, 0) + 1
-
-        # Sort by frequency
-        top_phrases = sorted(phrase_freq.items(), key=lambda x: x[1], reverse=True)
+        phrase_freq = Counter(
+            phrase for phrase in (p.strip() for p in key_phrases)
+            if len(phrase) > 3  # Minimum length
+        )
 
         # Return top N unique phrases
-        return [phrase for phrase, count in top_phrases[:top_n]]
+        return [phrase for phrase, count in phrase_freq.most_common(top_n)]
 
     except Exception as e:
         print(f"Error extracting key phrases: {e}")
@@ -437,26 +815,11 @@ def extract_keywords_simple(text: str, top_n: int = 10) -> List[str]:
     Returns:
         List of keywords
     """
-    # Remove common stop words
-    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                  'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'be', 'been',
-                  'this', 'that', 'these', 'those', 'will', 'would', 'should', 'could'}
-
-    # Extract words
-    words = re.findall(r'\b[a-z]{4,}\b', text.lower())
-
-    # Filter stop words
-    words = [w for w in words if w not in stop_words]
-
-    # Count frequencies
-    word_freq = {}
-    for word in words:
-        word_freq[word] = word_freq.get(word, 0) + 1
+    # Extract words, filter stop words and count frequencies
+    word_freq = Counter(w for w in _RE_KEYWORD.findall(text.lower()) if w not in _STOP_WORDS)
 
-    # Sort by frequency
-    top_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-
-    return [word for word, count in top_words[:top_n]]
+    # Most frequent first (ties keep first-seen order)
+    return [word for word, count in word_freq.most_common(top_n)]
 
 
 # ============================================================================
@@ -466,7 +829,7 @@ def extract_keywords_simple(text: str, top_n: int = 10) -> List[str]:
 def get_huggingface_summarizer():
     """
     Load HuggingFace summarization model (cached for reuse)
-    Uses BART-large-CNN - best free summarization model
+    Uses distilled BART-CNN by default (TOWNWATCH_SUMMARIZER_MODEL overrides it)
 
     Returns:
         Summarization pipeline
@@ -477,13 +840,59 @@ def get_huggingface_summarizer():
         return _hf_summarizer
 
     try:
+        import torch
         from transformers import pipeline
         print(f"Loading HuggingFace model: {_hf_model_name}")
 
+        # Use every vCPU Lambda gives us for the CPU forward passes
+        torch.set_num_threads(os.cpu_count() or 1)
+
+        if _hf_onnx_model_dir:
+            try:
+                from optimum.onnxruntime import ORTModelForSeq2SeqLM
+                from transformers import AutoTokenizer
+
+                # int8 ONNX Runtime model behind the same pipeline API
+                _hf_summarizer = pipeline(
+                    "summarization",
+                    model=ORTModelForSeq2SeqLM.from_pretrained(
+                        _hf_onnx_model_dir, provider="CPUExecutionProvider"
+                    ),
+                    tokenizer=AutoTokenizer.from_pretrained(_hf_onnx_model_dir),
+                    device=-1
+                )
+
+                print(f"✓ ONNX summarizer loaded from {_hf_onnx_model_dir}")
+                return _hf_summarizer
+
+            except Exception as e:
+                print(f"Error loading ONNX summarizer: {e}")
+                print("Falling back to PyTorch model")
+
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+        model = AutoModelForSeq2SeqLM.from_pretrained(_hf_model_name)
+
+        if _hf_quantize:
+            try:
+                # int8 weights for every nn.Linear: the forward passes are matmul-bound on CPU
+                with warnings.catch_warnings():
+                    # Only torch's notices that the eager quantization API is deprecated
+                    warnings.filterwarnings("ignore", message="torch.ao.quantization is deprecated",
+                                            category=DeprecationWarning)
+                    warnings.filterwarnings("ignore", message="torch.quantize_per_tensor",
+                                            category=UserWarning)
+                    model = torch.ao.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+            except Exception as e:
+                print(f"Error quantizing summarizer, using FP32: {e}")
+
         # Load model with optimizations for Lambda
         _hf_summarizer = pipeline(
             "summarization",
-            model=_hf_model_name,
+            model=model,
+            tokenizer=AutoTokenizer.from_pretrained(_hf_model_name),
             device=-1,  # Use CPU (Lambda doesn't have GPU)
             framework="pt"  # PyTorch
         )
@@ -519,44 +928,74 @@ def chunk_text_intelligently(text: str, max_chunk_size: int = 1024) -> List[str]
     # Rough estimate: 1 token ≈ 4 characters
     max_chars = max_chunk_size * 4
 
-    chunks = []
+    # Already fits in one chunk: both passes below would return it unchanged
+    if len(text) <= max_chars:
+        return [text.strip()]
 
     # Split on major section headers first (all caps lines)
-    section_pattern = r'\n([A-Z][A-Z\s]{10,})\n'
-    sections = re.split(section_pattern, text)
+    chunks = _pack_chunks(_RE_SECTION_HEADER.split(text), max_chars, "\n")
 
-    current_chunk = ""
+    # If no good section splits found, split on paragraphs
+    if len(chunks) <= 1:
+        chunks = _pack_chunks(text.split('\n\n'), max_chars, "\n\n")
 
-    for section in sections:
-        # If adding this section would exceed limit, save current chunk
-        if len(current_chunk) + len(section) > max_chars and current_chunk:
-            chunks.append(current_chunk.strip())
-            current_chunk = ""
+    return chunks
 
-        current_chunk += section + "\n"
 
-    # Add final chunk
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+def _pack_chunks(parts: List[str], max_chars: int, separator: str) -> List[str]:
+    """Greedily pack consecutive parts (joined by separator) into chunks of up to max_chars"""
+    chunks = []
+    current_parts: List[str] = []
+    current_len = 0
 
-    # If no good section splits found, split on paragraphs
-    if len(chunks) <= 1:
-        chunks = []
-        paragraphs = text.split('\n\n')
-        current_chunk = ""
+    for part in parts:
+        # If adding this part would exceed limit, save current chunk
+        if current_len + len(part) > max_chars and current_parts:
+            chunks.append(''.join(current_parts).strip())
+            current_parts = []
+            current_len = 0
 
-        for para in paragraphs:
-            if len(current_chunk) + len(para) > max_chars and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = ""
-            current_chunk += para + "\n\n"
+        current_parts.append(part + separator)
+        current_len += len(part) + len(separator)
 
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+    # Add final chunk
+    if current_parts:
+        chunks.append(''.join(current_parts).strip())
 
     return chunks
 
 
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'  # Same characters as the regex \w
+
+
+def _find_indicators(chunk_lower: str) -> set:
+    """Return the _INTERESTING_SCORES categories present in a lowercased chunk"""
+    found = set()
+
+    if _RE_MONEY.search(chunk_lower):
+        found.add('money')
+
+    if _INTERESTING_AUTOMATON is None:
+        found.update(category for category, pattern in _RE_INTERESTING_CATEGORIES.items()
+                     if pattern.search(chunk_lower))
+        return found
+
+    # One pass finds every keyword occurrence; keep those that are whole words
+    last = len(chunk_lower) - 1
+    for end, (category, length) in _INTERESTING_AUTOMATON.iter(chunk_lower):
+        if category in found:
+            continue
+        start = end - length + 1
+        if ((start == 0 or not _is_word_char(chunk_lower[start - 1]))
+                and (end == last or not _is_word_char(chunk_lower[end + 1]))):
+            found.add(category)
+            if len(found) == len(_INTERESTING_SCORES):
+                break
+
+    return found
+
+
 def extract_interesting_sections(text: str, top_n: int = 5) -> str:
     """
     Extract the most "interesting" sections from a large document
@@ -581,35 +1020,15 @@ def extract_interesting_sections(text: str, top_n: int = 5) -> str:
     # Score each chunk
     scored_chunks = []
 
-    for chunk in chunks:
+    for idx, chunk in enumerate(chunks):
         score = 0
         chunk_lower = chunk.lower()
 
-        # High-value indicators
-        if re.search(r'\$[\d,]+(?:\.\d+)?(?:\s?(?:million|billion|thousand))?', chunk):
-            score += 10  # Budget/money mentions
-
-        if re.search(r'\b(vote|voted|approved|passed|rejected|opposed)\b', chunk_lower):
-            score += 8  # Decisions/votes
-
-        if re.search(r'\b(resolution|ordinance|bill|legislation|policy)\b', chunk_lower):
-            score += 7  # Policy items
-
-        if re.search(r'\b(concern|objection|oppose|controversial|debate)\b', chunk_lower):
-            score += 6  # Controversy
-
-        if re.search(r'\b(will|shall|must|require)\b', chunk_lower):
-            score += 5  # Action items
-
-        if re.search(r'\b(amend|revise|change|new|establish)\b', chunk_lower):
-            score += 5  # Changes
-
-        # Penalty for procedural text
-        if re.search(r'\b(call to order|pledge of allegiance|roll call|minutes approved)\b', chunk_lower):
-            score -= 5  # Boring procedural stuff
+        # Each kind of indicator counts once per chunk
+        score += sum(_INTERESTING_SCORES[name] for name in _find_indicators(chunk_lower))
 
         # Bonus for being near the beginning (often has key items)
-        if chunks.index(chunk) < 3:
+        if idx < 3:
             score += 3
 
         scored_chunks.append((score, chunk))
@@ -650,41 +1069,38 @@ def summarize_with_huggingface(text: str, max_length: int = 500, min_length: int
             text = extract_interesting_sections(text, top_n=5)
             print(f"Filtered to {len(text)} chars of interesting content")
 
-        # Chunk text if still too large
-        chunks = chunk_text_intelligently(text, max_chunk_size=1024)
-
-        if len(chunks) == 0:
+        if not text.strip():
             return "No content to summarize."
 
-        print(f"Summarizing {len(chunks)} chunks with HuggingFace BART...")
-
-        summaries = []
+        # Chunk text if still too large (text within one window comes back as a single chunk)
+        chunks = chunk_text_intelligently(text, max_chunk_size=1024)
 
-        for i, chunk in enumerate(chunks[:10], 1):  # Limit to 10 chunks for performance
-            try:
-                # BART can handle up to 1024 tokens input
-                result = summarizer(
-                    chunk,
-                    max_length=max_length // len(chunks[:10]),  # Split summary length across chunks
-                    min_length=min(min_length, max_length // len(chunks[:10]) - 10),
-                    do_sample=False,  # Deterministic output
-                    truncation=True
-                )
+        print(f"Summarizing {len(chunks)} chunks with HuggingFace BART...")
 
-                if result and len(result) > 0:
-                    summary_text = result[0]['summary_text']
-                    summaries.append(summary_text)
-                    print(f"  ✓ Chunk {i}/{len(chunks[:10])} summarized")
+        chunks = chunks[:10]  # Limit to 10 chunks for performance
+        chunk_max_length = max_length // len(chunks)  # Split summary length across chunks
+
+        # All chunks go through the pipeline in one call so BART runs padded
+        # batches instead of one forward pass per chunk (inputs up to 1024 tokens)
+        results = summarizer(
+            chunks,
+            max_length=chunk_max_length,
+            min_length=min(min_length, chunk_max_length - 10),
+            do_sample=False,  # Deterministic output
+            truncation=True,
+            batch_size=min(len(chunks), 8)
+        )
 
-            except Exception as e:
-                print(f"  ✗ Error summarizing chunk {i}: {e}")
-                continue
+        summaries = [result['summary_text'] for result in results if result]
+        print(f"  ✓ {len(summaries)}/{len(chunks)} chunks summarized")
 
         # Combine summaries
         final_summary = " ".join(summaries)
 
-        # If combined summary is still too long, summarize again
-        if len(final_summary) > max_length * 4:  # Rough char estimate
+        # If combined summary is still too long, summarize again. A single chunk's
+        # summary is already capped at max_length, and several are measured in real
+        # tokens rather than guessed from their character count
+        if len(summaries) > 1 and len(summarizer.tokenizer(final_summary, verbose=False)['input_ids']) > max_length:
             print("Combined summary too long, doing second-pass summarization...")
             result = summarizer(
                 final_summary,
@@ -714,7 +1130,9 @@ def extract_and_summarize(pdf_url: Optional[str] = None,
                          method: str = 'huggingface',
                          pdf_max_pages: int = 1000,
                          pdf_max_chars: int = 500000,
-                         webpage_max_chars: int = 8000) -> Dict[str, Any]:
+                         webpage_max_chars: int = 8000,
+                         pdf_bytes: Optional[bytes] = None,
+                         pdf_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
     Extract content from PDF/webpage and create a summary
 
@@ -726,23 +1144,37 @@ def extract_and_summarize(pdf_url: Optional[str] = None,
         pdf_max_pages: Max pages to extract (default: 1000 for large docs)
         pdf_max_chars: Max characters to extract (default: 500000)
         webpage_max_chars: Max characters from webpage
+        pdf_bytes: Already-downloaded contents of pdf_url (optional)
+        pdf_headers: Response headers from prefetch_pdf for pdf_url (optional)
 
     Returns:
         Dictionary with 'full_text', 'summary', and 'key_phrases'
     """
     full_text_parts = []
 
-    # Extract from PDF
-    if pdf_url:
-        pdf_text = extract_pdf_text(pdf_url, max_pages=pdf_max_pages, max_chars=pdf_max_chars)
-        if pdf_text:
-            full_text_parts.append(pdf_text)
-
-    # Extract from webpage
-    if webpage_url:
-        web_text = extract_webpage_text(webpage_url, max_chars=webpage_max_chars)
-        if web_text:
-            full_text_parts.append(web_text)
+    # PDF and webpage fetches overlap each other and, on a cold start, the model load
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        pdf_future = executor.submit(
+            extract_pdf_text, pdf_url, max_pages=pdf_max_pages, max_chars=pdf_max_chars,
+            pdf_bytes=pdf_bytes, pdf_headers=pdf_headers
+        ) if pdf_url else None
+        web_future = executor.submit(
+            extract_webpage_text, webpage_url, max_chars=webpage_max_chars
+        ) if webpage_url else None
+        if method == 'huggingface' and _hf_summarizer is None and (pdf_future or web_future):
+            executor.submit(get_huggingface_summarizer)
+
+        # Extract from PDF
+        if pdf_future:
+            pdf_text = pdf_future.result()
+            if pdf_text:
+                full_text_parts.append(pdf_text)
+
+        # Extract from webpage
+        if web_future:
+            web_text = web_future.result()
+            if web_text:
+                full_text_parts.append(web_text)
 
     # Combine text
     full_text = '\n\n'.join(full_text_parts)
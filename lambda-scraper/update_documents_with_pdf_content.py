@@ -9,7 +9,9 @@ This script:
 """
 
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
@@ -19,6 +21,17 @@ load_dotenv()
 SUPABASE_URL = os.environ.get('SUPABASE_URL')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY')
 
+# Postgres text columns reject NUL characters; translate() drops them in one pass
+NULL_BYTE_TABLE = str.maketrans('', '', '\x00')
+
+def update_document_content(supabase: Client, document_id: str, content: str):
+    """Replace one document's content (runs on a worker thread)"""
+    return supabase.table('documents').update({
+        'content': content,
+        'updated_at': 'now()'
+    }).eq('id', document_id).execute()
+
+
 def update_documents():
     """Update documents with PDF-extracted content"""
     print("\n" + "="*80)
@@ -33,8 +46,8 @@ def update_documents():
 
         # Load our scraped documents with PDF content
         print("\n🔄 Loading scraped documents with PDF content...")
-        with open('test_output/baltimore_board_of_estimates.json', 'r') as f:
-            scraped_docs = json.load(f)
+        with open('test_output/baltimore_board_of_estimates.json', 'rb') as f:
+            scraped_docs = orjson.loads(f.read())
         print(f"✅ Loaded {len(scraped_docs)} documents with PDF content")
 
         # Get existing documents from Supabase
@@ -43,46 +56,57 @@ def update_documents():
         existing_docs = result.data
         print(f"✅ Found {len(existing_docs)} existing documents")
 
+        # Index by (title, date) for O(1) matching; the first document wins on duplicates
+        existing_by_key = {}
+        for doc in existing_docs:
+            existing_by_key.setdefault((doc['title'], doc['document_date']), doc)
+
         # Match and update
         print("\n🔄 Matching and updating documents...")
         updated_count = 0
         not_found_count = 0
 
-        for scraped in scraped_docs:
-            # Find matching document by title and date
-            title = scraped['title']
-            date = scraped['date']
+        # Each update is its own round-trip, so send them concurrently
+        pending_updates = []
 
-            # Find in existing
-            matching = [d for d in existing_docs if d['title'] == title and d['document_date'] == date]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for scraped in scraped_docs:
+                # Find matching document by title and date
+                title = scraped['title']
+                date = scraped['date']
 
-            if matching:
-                existing_id = matching[0]['id']
-                old_content = matching[0]['content'][:100] + "..." if matching[0]['content'] else "No content"
-                new_content = scraped['content'][:100] + "..."
+                # Find in existing
+                existing = existing_by_key.get((title, date))
 
-                print(f"\n  📝 Updating: {title}")
-                print(f"     Old content ({len(matching[0]['content'])} chars): {old_content}")
-                print(f"     New content ({len(scraped['content'])} chars): {new_content}")
+                if existing:
+                    existing_id = existing['id']
+                    old_content = existing['content'][:100] + "..." if existing['content'] else "No content"
+                    new_content = scraped['content'][:100] + "..."
 
-                # Clean content - remove null bytes and other problematic characters
-                clean_content = scraped['content'].replace('\x00', '').replace('\u0000', '')
+                    print(f"\n  📝 Updating: {title}")
+                    print(f"     Old content ({len(existing['content'])} chars): {old_content}")
+                    print(f"     New content ({len(scraped['content'])} chars): {new_content}")
 
-                # Update the document
-                update_result = supabase.table('documents').update({
-                    'content': clean_content,
-                    'updated_at': 'now()'
-                }).eq('id', existing_id).execute()
+                    # Clean content - remove null bytes and other problematic characters
+                    clean_content = scraped['content'].translate(NULL_BYTE_TABLE)
+
+                    # Update the document
+                    pending_updates.append(
+                        (title, executor.submit(update_document_content, supabase, existing_id, clean_content))
+                    )
 
-                if update_result.data:
-                    updated_count += 1
-                    print(f"     ✅ Updated!")
                 else:
-                    print(f"     ❌ Update failed")
+                    not_found_count += 1
+                    print(f"\n  ⚠️  No match found for: {title} ({date})")
 
-            else:
-                not_found_count += 1
-                print(f"\n  ⚠️  No match found for: {title} ({date})")
+            # Report results in the same order as above
+            print("\n🔄 Waiting for updates...")
+            for title, future in pending_updates:
+                if future.result().data:
+                    updated_count += 1
+                    print(f"  ✅ Updated: {title}")
+                else:
+                    print(f"  ❌ Update failed: {title}")
 
         # Summary
         print("\n" + "="*80)